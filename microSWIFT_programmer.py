@@ -1,155 +1,345 @@
 #!/usr/bin/python3
+import functools
+import json
 import platform
 import struct
 import sys
 import os
-import requests
-import serial.tools.list_ports
 import re
+import shutil
 import subprocess
+import threading
+import time
 
 from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtGui import QTextCharFormat, QColor, QGuiApplication, QFont, QFontDatabase
-from PyQt6.QtWidgets import QGraphicsScene, QGraphicsPixmapItem
-from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import pyqtSignal, QThread, Qt
+from PyQt6.QtCore import pyqtSignal, QFileSystemWatcher, QObject, QRunnable, QSignalBlocker, QThreadPool, Qt
+from PyQt6.QtGui import QTextCharFormat, QTextCursor, QColor, QGuiApplication, QFont, QPixmap
+from PyQt6.QtWidgets import QButtonGroup, QGraphicsScene, QGraphicsPixmapItem
 
 from datetime import datetime
 
 FIRMWARE_MAJOR_VERSION = 2
 FIRMWARE_MINOR_VERSION = 2
 
+# STM32_Programmer_CLI colors its output with ANSI escape codes
+_ANSI_RE = re.compile(rb'\x1b\[[0-9;]*[mG]')
+
+# Seconds before a hung STM32_Programmer_CLI is killed
+PROGRAMMER_TIMEOUT = 180
+
+# Bytes requested per read of the programmer's output pipe
+PIPE_READ_SIZE = 65536
+
+# Bytes copied per read while downloading the firmware
+DOWNLOAD_CHUNK_SIZE = 262144
+
+# Seconds a USB port scan is reused before comports() is called again
+PORT_SCAN_TTL = 1.0
+
+# Lines kept in the status pane; older programmer output is dropped past this
+STATUS_MAX_BLOCKS = 2000
+
+# Verify button look for each state: not yet verified, failed, passed
+_VERIFY_BUTTON_STYLE = "background-color: {}; color: white; border-radius: 5px; font-size: 16px;"
+VERIFY_BUTTON_STYLES = {color: _VERIFY_BUTTON_STYLE.format(color) for color in ("gray", "red", "green")}
+
+# GNSS sampling rate drop box labels and their rates in Hz
+_GNSS_RATE_HZ = {"4 Hz": 4, "5 Hz": 5}
+
+# Matches the packed microSWIFT_configuration struct in the firmware's configuration.h
+_CONFIG_STRUCT = struct.Struct("<9L6?11s9s")
+
+_LOGO_PIXMAP = None
+
+# Outcomes of the firmware download at startup
+FIRMWARE_DOWNLOADED = "downloaded"
+FIRMWARE_UP_TO_DATE = "up to date"
+FIRMWARE_CACHED = "cached"  # couldn't reach the server, using the copy already on disk
+FIRMWARE_MISSING = "missing"
+
+# Connect and read timeouts in seconds for the firmware download
+DOWNLOAD_TIMEOUT = (5, 30)
+
+_SYSTEM = platform.system()
+PROGRAMMER_PATH = {
+    "Darwin": ("/Applications/STMicroelectronics/STM32Cube/STM32CubeProgrammer/"
+               "STM32CubeProgrammer.app/Contents/MacOs/bin/STM32_Programmer_CLI"),
+    "Windows": ("C:\\Program Files\\STMicroelectronics\\STM32Cube\\STM32CubeProgrammer\\bin"
+                "\\STM32_Programmer_CLI.exe"),
+    "Linux": os.path.expanduser("~/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin/STM32_Programmer_CLI"),
+}.get(_SYSTEM)
+PROGRAMMER_FOUND = PROGRAMMER_PATH is not None and os.path.isfile(PROGRAMMER_PATH)
+
+# Absolute, so programming works no matter which directory the tool is launched from
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+FIRMWARE_DIR = os.path.join(APP_DIR, "firmware")
+FIRMWARE_ELF_PATH = os.path.join(FIRMWARE_DIR, "microSWIFT_V2.2.elf")
+CONFIG_BIN_PATH = os.path.join(FIRMWARE_DIR, "config.bin")
+LOGO_PATH = os.path.join(APP_DIR, "microSWIFT_pic.png")
+
+# The command to run STM32CubeProgrammer. The firmware and the configuration bytes are
+# burned in one session so the SWD connection and target reset only happen once.
+PROGRAMMER_COMMAND = (
+    PROGRAMMER_PATH,
+    "--connect", "port=SWD",  # Specify the port (e.g., USB, JTAG)
+    "--download", FIRMWARE_ELF_PATH,  # Firmware file to write to the device
+    "0x08000000",  # download address
+    "--verify",  # Verify after programming
+    "--download", CONFIG_BIN_PATH,  # Configuration bytes to write to the device
+    "0x083FFC00",  # download address
+    "--verify",  # Verify after programming
+    "--start", "0x08000000"  # Start after programming and verification (at address 0x08000000)
+)
+
+# Shown in the status pane at startup
+_BANNER = (
+    "           _        "
+    "       ______       "
+    " _____ _____ _____  "
+    "   \r\n"
+    " _ __ ___ (_) ___ _ "
+    "__ ___/ ___\\ \\    "
+    "  / /_ _|  ___|_   _"
+    "|    \r\n"
+    "| \'_ ` _ \\| |/ __|"
+    " \'__/ _ \\___ \\\\ "
+    "\\ /\\ / / | || |_  "
+    "  | |      \r\n"
+    "| | | | | | | (__| |"
+    " | (_) |__) |\\ V  V"
+    " /  | ||  _|   | |  "
+    "    \r\n"
+    "|_|_|_| |_|_|\\___|_"
+    "|  \\___/____/  \\_/"
+    "\\_/  |___|_|     |_"
+    "|      \r\n"
+    "|  _ \\ _ __ ___   _"
+    "_ _ _ __ __ _ _ __ _"
+    "__  _ __ ___   ___ _"
+    " __ \r\n"
+    "| |_) | \'__/ _ \\ /"
+    " _` | \'__/ _` | \'_"
+    " ` _ \\| \'_ ` _ \\ "
+    "/ _ \\ \'__|\r\n"
+    "|  __/| | | (_) | (_"
+    "| | | | (_| | | | | "
+    "| | | | | | |  __/ |"
+    "   \r\n"
+    "|_|   |_|  \\___/ \\"
+    "__, |_|  \\__,_|_| |"
+    "_| |_|_| |_| |_|\\__"
+    "_|_|   \r\n"
+    "                 |__"
+    "_/                  "
+    "                    "
+    "   "
+    "\r\r\nDon't forget to update this tool!!! Insert repo link here."
+)
+
+
+def logo_pixmap():
+    # QPixmap needs a QGuiApplication, so the picture is decoded on first use rather than at import
+    global _LOGO_PIXMAP
+    if _LOGO_PIXMAP is None:
+        _LOGO_PIXMAP = QPixmap(LOGO_PATH)
+    return _LOGO_PIXMAP
+
 
 def download_microSWIFT_firmware():
+    # requests drags in urllib3, charset_normalizer and certifi; only pay for them when downloading
+    import requests
+    import urllib3
+
     # Raw file URL on GitHub
     url = "https://github.com/SASlabgroup/microSWIFT-V2-Binaries/raw/main/V2.2/microSWIFT_V2.2.elf"
 
     # Define local path to save the file
-    firmware_dir = os.path.join(os.path.dirname(__file__), "firmware")
-    local_file_path = os.path.join(firmware_dir, "microSWIFT_V2.2.elf")
+    local_file_path = FIRMWARE_ELF_PATH
+    meta_file_path = local_file_path + ".meta.json"
+
+    # If we already have the firmware, only fetch it again if it changed on the server
+    headers = {}
+    if os.path.isfile(local_file_path):
+        try:
+            with open(meta_file_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
 
-    # Ensure the firmware directory exists
-    os.makedirs(firmware_dir, exist_ok=True)
+        if meta.get("ETag"):
+            headers["If-None-Match"] = meta["ETag"]
+        if meta.get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["Last-Modified"]
 
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()  # Raise an error on bad HTTP status
+        # Ensure the firmware directory exists
+        os.makedirs(FIRMWARE_DIR, exist_ok=True)
+
+        with requests.get(url, stream=True, headers=headers, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()  # Raise an error on bad HTTP status
 
-        # Write the file (overwrite if exists)
-        with open(local_file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            if response.status_code == 304:
+                print("Firmware file is up to date.")
+                return FIRMWARE_UP_TO_DATE
 
-        print("Firmware file downloaded and saved successfully.")
-        return True
-    except requests.RequestException as e:
+            # Write to a temporary file and swap it in, so an interrupted download never replaces a good ELF
+            temp_file_path = local_file_path + ".tmp"
+            response.raw.decode_content = True
+            try:
+                with open(temp_file_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
+                os.replace(temp_file_path, local_file_path)
+            except BaseException:
+                # Don't leave a partial download lying around
+                try:
+                    os.remove(temp_file_path)
+                except OSError:
+                    pass
+                raise
+
+            # The ELF is in place at this point; failing to save the cache headers only costs a full
+            # download next time
+            try:
+                with open(meta_file_path, 'w') as f:
+                    json.dump({key: response.headers[key] for key in ("ETag", "Last-Modified")
+                               if key in response.headers}, f)
+            except OSError as e:
+                print(f"Failed to save the firmware cache headers: {e}")
+
+            print("Firmware file downloaded and saved successfully.")
+            return FIRMWARE_DOWNLOADED
+    except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+        # Reading response.raw directly surfaces urllib3 errors that iter_content used to wrap
         print(f"Failed to download the firmware file: {e}")
-        return False
+        return local_firmware_state()
+
+
+def local_firmware_state():
+    # Files are only ever swapped in whole, so a firmware already on disk is safe to program
+    return FIRMWARE_CACHED if os.path.isfile(FIRMWARE_ELF_PATH) else FIRMWARE_MISSING
 
-class Worker(QThread):
+
+class WorkerSignals(QObject):
     finished = pyqtSignal()
     stdoutAvailable = pyqtSignal(str)
     stderrAvailable = pyqtSignal(str)
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
+
+class DownloadSignals(QObject):
+    downloadReady = pyqtSignal(str)
+
+
+class DownloadRunnable(QRunnable):
+    # Fetches the firmware in the background while the user fills in the configuration
+    def __init__(self):
+        super().__init__()
+        self.signals = DownloadSignals()
 
     def run(self):
-        firmwareBurnSuccessful = False
-        systemOS = platform.system()
-
-        if systemOS == "Darwin":  # MacOS
-            programmerPath = ("/Applications/STMicroelectronics/STM32Cube/STM32CubeProgrammer/"
-                              "STM32CubeProgrammer.app/Contents/MacOs/bin/STM32_Programmer_CLI")
-        else:  # Windows
-            programmerPath = ("C:\\Program Files\\STMicroelectronics\\STM32Cube\\STM32CubeProgrammer\\bin"
-                              "\\STM32_Programmer_CLI.exe")
-
-        # Define the command to run STM32CubeProgrammer
-        command = [
-            programmerPath,
-            "--connect", "port=SWD",  # Specify the port (e.g., USB, JTAG)
-            "--download", "firmware/microSWIFT_V2.2.elf",  # Firmware file to write to the device
-            "0x08000000",  # download address
-            "--verify",  # Verify after programming
-        ]
-
-        # command = [programmerPath,"--connect"]
-
-        # Burn the firmware first
         try:
-            process = subprocess.Popen(command, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-            # Do other work while the subprocess is running
-            while process.poll() is None:
-                # Retrieve output (if needed)
-                stdout, stderr = process.communicate()
-
-                if stdout:
-                    cleanedText = re.sub(r'\x1b\[[0-9;]*[mG]', '', stdout)
-                    self.stdoutAvailable.emit(cleanedText)
-
-            if process.returncode == 0:
-                firmwareBurnSuccessful = True
-            else:
-                self.stderrAvailable.emit(f"\nProgramming Failed with code {process.returncode}")
-                firmwareBurnSuccessful = False
-
-        except subprocess.CalledProcessError as e:
-            # If there's an error, show the error message
-            self.stderrAvailable.emit(f"/nError: {e.stderr}")
-            self.stderrAvailable.emit(e.stdout)
-            firmwareBurnSuccessful = False
+            state = download_microSWIFT_firmware()
         except Exception as e:
-            self.writeError(f"Unexpected error: {str(e)}")
-            firmwareBurnSuccessful = False
-
-        if firmwareBurnSuccessful:
-            command = [
-                programmerPath,
-                "--connect", "port=SWD",  # Specify the port (e.g., USB, JTAG)
-                "--download", "firmware/config.bin",  # Firmware file to write to the device
-                "0x083FFC00",  # download address
-                "--verify",  # Verify after programming
-                "--start", "0x08000000"  # Start after programming and verification (at address 0x08000000)
-            ]
-
-            # Burn the configuration bytes
-            try:
-                process = subprocess.Popen(command, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            print(f"Unexpected error while downloading the firmware file: {e!s}")
+            state = local_firmware_state()
+        self.signals.downloadReady.emit(state)
+
+
+class ProgramRunnable(QRunnable):
+    # One-shot programming job, run on a thread borrowed from the global QThreadPool.
+    # QRunnable can't own signals, so they live on a separate QObject.
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+
+    def run(self):
+        if not PROGRAMMER_FOUND:
+            self.signals.stderrAvailable.emit("\nSTM32_Programmer_CLI not found, nothing was programmed.")
+            self.signals.finished.emit()
+            return
+
+        try:
+            returncode = self.runProgrammer(PROGRAMMER_COMMAND)
 
-                # Do other work while the subprocess is running
-                while process.poll() is None:
-                    # Retrieve output (if needed)
-                    stdout, stderr = process.communicate()
+            if returncode != 0:
+                self.signals.stderrAvailable.emit(f"\nProgramming Failed with code {returncode}")
 
-                    if stdout:
-                        cleanedText = re.sub(r'\x1b\[[0-9;]*[mG]', '', stdout)
-                        self.stdoutAvailable.emit(cleanedText)
+        except subprocess.TimeoutExpired as e:
+            self.signals.stderrAvailable.emit(f"\nProgramming timed out after {e.timeout} seconds")
+        except Exception as e:
+            self.signals.stderrAvailable.emit(f"Unexpected error: {e!s}")
+
+        self.signals.finished.emit()
 
-                if process.returncode != 0:
-                    self.stderrAvailable.emit(f"\nProgramming Failed with code {process.returncode}")
+    def runProgrammer(self, command):
+        env = {**os.environ, "NO_COLOR": "1", "TERM": "dumb"}
+        # Uncolored output (cleanLine still strips ANSI), stderr merged into stdout so one pipe is drained
+        process = subprocess.Popen(command, bufsize=0, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
 
-            except subprocess.CalledProcessError as e:
-                # If there's an error, show the error message
-                self.stderrAvailable.emit(f"/nError: {e.stderr}")
-                self.stderrAvailable.emit(e.stdout)
-            except Exception as e:
-                self.writeError(f"Unexpected error: {str(e)}")
+        # Kill a wedged programmer so its pipes close and the GUI isn't left disabled forever
+        timedOut = threading.Event()
 
+        def killProgrammer():
+            timedOut.set()
+            process.kill()
 
-        self.finished.emit()
+        watchdog = threading.Timer(PROGRAMMER_TIMEOUT, killProgrammer)
+        watchdog.start()
+
+        try:
+            # Blocks in the kernel until the programmer writes something
+            self.forwardOutput(process.stdout, self.signals.stdoutAvailable)
+
+            returncode = process.wait()
+        finally:
+            watchdog.cancel()
+
+        if timedOut.is_set():
+            raise subprocess.TimeoutExpired(command, PROGRAMMER_TIMEOUT)
+
+        return returncode
+
+    def forwardOutput(self, pipe, signal):
+        # Split on '\n' only; '\r' redraws are collapsed in cleanLine
+        # One signal per read, so bursts of output are batched
+        fd = pipe.fileno()
+        partial = b""
+
+        with pipe:
+            while chunk := os.read(fd, PIPE_READ_SIZE):
+                *lines, partial = (partial + chunk).split(b"\n")
+                if lines:
+                    signal.emit(b"\n".join(map(self.cleanLine, lines)).decode(errors="replace"))
+
+            if partial:
+                signal.emit(self.cleanLine(partial).decode(errors="replace"))
+
+    @staticmethod
+    def cleanLine(line):
+        # Keep only the final redraw of a '\r'-updated line and drop the ANSI colors. Works on the raw
+        # bytes (the escapes are ASCII) so a whole batch is decoded once.
+        line = line.rstrip(b"\r").rsplit(b"\r", 1)[-1]
+        if b"\x1b" in line:
+            line = _ANSI_RE.sub(b'', line)
+        return line
 
 
 class Ui_MainWindow(object):
     device_connected = False
     stlink_port = ""
-    configFilePath = "firmware/config.bin"
-    colorScheme = []
+    last_port_scan = None
+    pixmapItem = None
+    configFilePath = CONFIG_BIN_PATH
+    colorScheme = Qt.ColorScheme.Unknown
+    verifyState = None
+    firmwareReady = False
+    statusMessage = None
 
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
         MainWindow.resize(640, 800)
+        # QFont is implicitly shared, so one instance serves every 12pt widget
+        font12 = QtGui.QFont()
+        font12.setPointSize(12)
         self.centralwidget = QtWidgets.QWidget(parent=MainWindow)
         self.centralwidget.setObjectName("centralwidget")
         self.ctFrame = QtWidgets.QFrame(parent=self.centralwidget)
@@ -164,16 +354,12 @@ class Ui_MainWindow(object):
         self.ctVertLayout.setContentsMargins(0, 0, 0, 0)
         self.ctVertLayout.setObjectName("ctVertLayout")
         self.ctEnableButton = QtWidgets.QRadioButton(parent=self.layoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.ctEnableButton.setFont(font)
+        self.ctEnableButton.setFont(font12)
         self.ctEnableButton.setObjectName("ctEnableButton")
         self.ctEnableButton.setAutoExclusive(False)
         self.ctVertLayout.addWidget(self.ctEnableButton)
         self.tempEnableButton = QtWidgets.QRadioButton(parent=self.layoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.tempEnableButton.setFont(font)
+        self.tempEnableButton.setFont(font12)
         self.tempEnableButton.setObjectName("tempEnableButton")
         self.tempEnableButton.setAutoExclusive(False)
         self.ctVertLayout.addWidget(self.tempEnableButton)
@@ -191,16 +377,12 @@ class Ui_MainWindow(object):
         self.lightEnableHorizLayout = QtWidgets.QHBoxLayout()
         self.lightEnableHorizLayout.setObjectName("lightEnableHorizLayout")
         self.lightEnableButton = QtWidgets.QRadioButton(parent=self.layoutWidget1)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.lightEnableButton.setFont(font)
+        self.lightEnableButton.setFont(font12)
         self.lightEnableButton.setObjectName("lightEnableButton")
         self.lightEnableHorizLayout.addWidget(self.lightEnableButton)
         self.lightMatchGNSSCheckbox = QtWidgets.QCheckBox(parent=self.layoutWidget1)
         self.lightMatchGNSSCheckbox.setEnabled(False)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.lightMatchGNSSCheckbox.setFont(font)
+        self.lightMatchGNSSCheckbox.setFont(font12)
         self.lightMatchGNSSCheckbox.setObjectName("lightMatchGNSSCheckbox")
         self.lightEnableHorizLayout.addWidget(self.lightMatchGNSSCheckbox)
         self.lightVerticalLayout.addLayout(self.lightEnableHorizLayout)
@@ -219,16 +401,12 @@ class Ui_MainWindow(object):
         self.lightSamplesHorizLayout.setObjectName("lightSamplesHorizLayout")
         self.lightNumSamplesLabel = QtWidgets.QLabel(parent=self.layoutWidget1)
         self.lightNumSamplesLabel.setEnabled(False)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.lightNumSamplesLabel.setFont(font)
+        self.lightNumSamplesLabel.setFont(font12)
         self.lightNumSamplesLabel.setObjectName("lightNumSamplesLabel")
         self.lightSamplesHorizLayout.addWidget(self.lightNumSamplesLabel)
         self.lightNumSamplesSpinBox = QtWidgets.QSpinBox(parent=self.layoutWidget1)
         self.lightNumSamplesSpinBox.setEnabled(False)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.lightNumSamplesSpinBox.setFont(font)
+        self.lightNumSamplesSpinBox.setFont(font12)
         self.lightNumSamplesSpinBox.setMaximum(1800)
         self.lightNumSamplesSpinBox.setProperty("value", 512)
         self.lightNumSamplesSpinBox.setObjectName("lightNumSamplesSpinBox")
@@ -248,15 +426,11 @@ class Ui_MainWindow(object):
         self.iridiumTxTimeHorizLayout = QtWidgets.QHBoxLayout()
         self.iridiumTxTimeHorizLayout.setObjectName("iridiumTxTimeHorizLayout")
         self.iridiumTxTimeLabel = QtWidgets.QLabel(parent=self.layoutWidget2)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.iridiumTxTimeLabel.setFont(font)
+        self.iridiumTxTimeLabel.setFont(font12)
         self.iridiumTxTimeLabel.setObjectName("iridiumTxTimeLabel")
         self.iridiumTxTimeHorizLayout.addWidget(self.iridiumTxTimeLabel)
         self.iridiumTxTimeSpinBox = QtWidgets.QSpinBox(parent=self.layoutWidget2)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.iridiumTxTimeSpinBox.setFont(font)
+        self.iridiumTxTimeSpinBox.setFont(font12)
         self.iridiumTxTimeSpinBox.setMaximum(60)
         self.iridiumTxTimeSpinBox.setProperty("value", 5)
         self.iridiumTxTimeSpinBox.setObjectName("iridiumTxTimeSpinBox")
@@ -265,15 +439,11 @@ class Ui_MainWindow(object):
         self.iridiumTypeHorizLayoutr = QtWidgets.QHBoxLayout()
         self.iridiumTypeHorizLayoutr.setObjectName("iridiumTypeHorizLayoutr")
         self.iridiumTypeComboBox = QtWidgets.QComboBox(parent=self.layoutWidget2)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.iridiumTypeComboBox.setFont(font)
+        self.iridiumTypeComboBox.setFont(font12)
         self.iridiumTypeComboBox.setObjectName("iridiumTypeComboBox")
         self.iridiumTypeHorizLayoutr.addWidget(self.iridiumTypeComboBox)
         self.iridiumTypeLabel = QtWidgets.QLabel(parent=self.layoutWidget2)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.iridiumTypeLabel.setFont(font)
+        self.iridiumTypeLabel.setFont(font12)
         self.iridiumTypeLabel.setObjectName("iridiumTypeLabel")
         self.iridiumTypeHorizLayoutr.addWidget(self.iridiumTypeLabel)
         self.iridiumVertLayout.addLayout(self.iridiumTypeHorizLayoutr)
@@ -291,15 +461,11 @@ class Ui_MainWindow(object):
         self.gnssSamplesHorizLayout = QtWidgets.QHBoxLayout()
         self.gnssSamplesHorizLayout.setObjectName("gnssSamplesHorizLayout")
         self.gnssNumSamplesLabel = QtWidgets.QLabel(parent=self.layoutWidget_11)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.gnssNumSamplesLabel.setFont(font)
+        self.gnssNumSamplesLabel.setFont(font12)
         self.gnssNumSamplesLabel.setObjectName("gnssNumSamplesLabel")
         self.gnssSamplesHorizLayout.addWidget(self.gnssNumSamplesLabel)
         self.gnssNumSamplesSpinBox = QtWidgets.QSpinBox(parent=self.layoutWidget_11)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.gnssNumSamplesSpinBox.setFont(font)
+        self.gnssNumSamplesSpinBox.setFont(font12)
         self.gnssNumSamplesSpinBox.setMaximum(32768)
         self.gnssNumSamplesSpinBox.setProperty("value", 4096)
         self.gnssNumSamplesSpinBox.setObjectName("gnssNumSamplesSpinBox")
@@ -311,15 +477,11 @@ class Ui_MainWindow(object):
         self.gnssSampleRateHorizLayout = QtWidgets.QHBoxLayout()
         self.gnssSampleRateHorizLayout.setObjectName("gnssSampleRateHorizLayout")
         self.gnssSampleRateComboBox = QtWidgets.QComboBox(parent=self.layoutWidget_11)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.gnssSampleRateComboBox.setFont(font)
+        self.gnssSampleRateComboBox.setFont(font12)
         self.gnssSampleRateComboBox.setObjectName("gnssSampleRateComboBox")
         self.gnssSampleRateHorizLayout.addWidget(self.gnssSampleRateComboBox)
         self.gnssSampleRateLabel = QtWidgets.QLabel(parent=self.layoutWidget_11)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.gnssSampleRateLabel.setFont(font)
+        self.gnssSampleRateLabel.setFont(font12)
         self.gnssSampleRateLabel.setObjectName("gnssSampleRateLabel")
         self.gnssSampleRateHorizLayout.addWidget(self.gnssSampleRateLabel)
         self.gnssVertLayout.addLayout(self.gnssSampleRateHorizLayout)
@@ -337,15 +499,11 @@ class Ui_MainWindow(object):
         self.dutyCycleHorizLayout = QtWidgets.QHBoxLayout()
         self.dutyCycleHorizLayout.setObjectName("dutyCycleHorizLayout")
         self.dutyCycleLabel = QtWidgets.QLabel(parent=self.verticalLayoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.dutyCycleLabel.setFont(font)
+        self.dutyCycleLabel.setFont(font12)
         self.dutyCycleLabel.setObjectName("dutyCycleLabel")
         self.dutyCycleHorizLayout.addWidget(self.dutyCycleLabel)
         self.dutyCycleSpinBox = QtWidgets.QSpinBox(parent=self.verticalLayoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.dutyCycleSpinBox.setFont(font)
+        self.dutyCycleSpinBox.setFont(font12)
         self.dutyCycleSpinBox.setMaximum(1440)
         self.dutyCycleSpinBox.setProperty("value", 30)
         self.dutyCycleSpinBox.setObjectName("dutyCycleSpinBox")
@@ -354,16 +512,12 @@ class Ui_MainWindow(object):
         self.gnssBufferTimeHorizLayout = QtWidgets.QHBoxLayout()
         self.gnssBufferTimeHorizLayout.setObjectName("gnssBufferTimeHorizLayout")
         self.gnssMaxAcqusitionTimeLabel = QtWidgets.QLabel(parent=self.verticalLayoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.gnssMaxAcqusitionTimeLabel.setFont(font)
+        self.gnssMaxAcqusitionTimeLabel.setFont(font12)
         self.gnssMaxAcqusitionTimeLabel.setWhatsThis("")
         self.gnssMaxAcqusitionTimeLabel.setObjectName("gnssMaxAcqusitionTimeLabel")
         self.gnssBufferTimeHorizLayout.addWidget(self.gnssMaxAcqusitionTimeLabel)
         self.gnssMaxAcquisitionTimeSpinBox = QtWidgets.QSpinBox(parent=self.verticalLayoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.gnssMaxAcquisitionTimeSpinBox.setFont(font)
+        self.gnssMaxAcquisitionTimeSpinBox.setFont(font12)
         self.gnssMaxAcquisitionTimeSpinBox.setWhatsThis("")
         self.gnssMaxAcquisitionTimeSpinBox.setMaximum(10)
         self.gnssMaxAcquisitionTimeSpinBox.setProperty("value", 5)
@@ -373,15 +527,11 @@ class Ui_MainWindow(object):
         self.trackingNumberHorizLayourt = QtWidgets.QHBoxLayout()
         self.trackingNumberHorizLayourt.setObjectName("trackingNumberHorizLayourt")
         self.trackingNumberLabel = QtWidgets.QLabel(parent=self.verticalLayoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.trackingNumberLabel.setFont(font)
+        self.trackingNumberLabel.setFont(font12)
         self.trackingNumberLabel.setObjectName("trackingNumberLabel")
         self.trackingNumberHorizLayourt.addWidget(self.trackingNumberLabel)
         self.trackingNumberSpinBox = QtWidgets.QSpinBox(parent=self.verticalLayoutWidget)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.trackingNumberSpinBox.setFont(font)
+        self.trackingNumberSpinBox.setFont(font12)
         self.trackingNumberSpinBox.setMaximum(1000)
         self.trackingNumberSpinBox.setProperty("value", 100)
         self.trackingNumberSpinBox.setObjectName("trackingNumberSpinBox")
@@ -406,15 +556,11 @@ class Ui_MainWindow(object):
         self.devicePortLabel.setObjectName("devicePortLabel")
         self.statusAndProgVertLayout.addWidget(self.devicePortLabel)
         self.verifyButton = QtWidgets.QPushButton(parent=self.layoutWidget3)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.verifyButton.setFont(font)
+        self.verifyButton.setFont(font12)
         self.verifyButton.setObjectName("verifyButton")
         self.statusAndProgVertLayout.addWidget(self.verifyButton)
         self.programButton = QtWidgets.QPushButton(parent=self.layoutWidget3)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.programButton.setFont(font)
+        self.programButton.setFont(font12)
         self.programButton.setObjectName("programButton")
         self.statusAndProgVertLayout.addWidget(self.programButton)
         self.turbidityFrame = QtWidgets.QFrame(parent=self.centralwidget)
@@ -431,16 +577,12 @@ class Ui_MainWindow(object):
         self.turbidityEnableHorizLayout = QtWidgets.QHBoxLayout()
         self.turbidityEnableHorizLayout.setObjectName("turbidityEnableHorizLayout")
         self.turbidityEnableButton = QtWidgets.QRadioButton(parent=self.layoutWidget_2)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.turbidityEnableButton.setFont(font)
+        self.turbidityEnableButton.setFont(font12)
         self.turbidityEnableButton.setObjectName("turbidityEnableButton")
         self.turbidityEnableHorizLayout.addWidget(self.turbidityEnableButton)
         self.turbidityMatchGNSSCheckbox = QtWidgets.QCheckBox(parent=self.layoutWidget_2)
         self.turbidityMatchGNSSCheckbox.setEnabled(False)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.turbidityMatchGNSSCheckbox.setFont(font)
+        self.turbidityMatchGNSSCheckbox.setFont(font12)
         self.turbidityMatchGNSSCheckbox.setObjectName("turbidityMatchGNSSCheckbox")
         self.turbidityEnableHorizLayout.addWidget(self.turbidityMatchGNSSCheckbox)
         self.turbidityVerticalLayout.addLayout(self.turbidityEnableHorizLayout)
@@ -448,16 +590,12 @@ class Ui_MainWindow(object):
         self.turbiditySamplesHorizLayout.setObjectName("turbiditySamplesHorizLayout")
         self.turbidityNumSamplesLabel = QtWidgets.QLabel(parent=self.layoutWidget_2)
         self.turbidityNumSamplesLabel.setEnabled(False)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.turbidityNumSamplesLabel.setFont(font)
+        self.turbidityNumSamplesLabel.setFont(font12)
         self.turbidityNumSamplesLabel.setObjectName("turbidityNumSamplesLabel")
         self.turbiditySamplesHorizLayout.addWidget(self.turbidityNumSamplesLabel)
         self.turbidityNumSamplesSpinBox = QtWidgets.QSpinBox(parent=self.layoutWidget_2)
         self.turbidityNumSamplesSpinBox.setEnabled(False)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.turbidityNumSamplesSpinBox.setFont(font)
+        self.turbidityNumSamplesSpinBox.setFont(font12)
         self.turbidityNumSamplesSpinBox.setMaximum(3600)
         self.turbidityNumSamplesSpinBox.setProperty("value", 1024)
         self.turbidityNumSamplesSpinBox.setObjectName("turbidityNumSamplesSpinBox")
@@ -499,11 +637,52 @@ class Ui_MainWindow(object):
 
     def finishSetup(self):
         # Added functionality
-        self.worker = Worker()
-        self.thread = QThread()
-        self.worker.moveToThread(self.thread)
         self.scene = QGraphicsScene()
 
+        # Get the firmware while the user is busy configuring; Program stays locked until it's here
+        download = DownloadRunnable()
+        download.signals.downloadReady.connect(self.onDownloadReady)
+        QThreadPool.globalInstance().start(download)
+
+        # Status pane text formats, built once and reused for every message
+        self.redFormat = QTextCharFormat()
+        self.redFormat.setForeground(QColor(Qt.GlobalColor.red))
+        self.whiteFormat = QTextCharFormat()
+        self.whiteFormat.setForeground(QColor(Qt.GlobalColor.white))
+        self.blackFormat = QTextCharFormat()
+        self.blackFormat.setForeground(QColor(Qt.GlobalColor.black))
+
+        # Track light/dark mode as it changes rather than asking on every write
+        styleHints = QGuiApplication.styleHints()
+        self.colorScheme = styleHints.colorScheme()
+        styleHints.colorSchemeChanged.connect(self.onColorSchemeChanged)
+
+        # Reused by assembleBinaryConfigFile on every Program click
+        self.configBuffer = bytearray(_CONFIG_STRUCT.size)
+
+        # Widgets locked while the programmer runs
+        self.programmingLockedWidgets = (self.ctEnableButton, self.tempEnableButton, self.lightEnableButton,
+                                         self.turbidityEnableButton, self.iridiumTxTimeSpinBox,
+                                         self.iridiumTypeComboBox, self.gnssNumSamplesSpinBox,
+                                         self.gnssHighPerformanceModeCheckBox, self.gnssSampleRateComboBox,
+                                         self.dutyCycleSpinBox, self.gnssMaxAcquisitionTimeSpinBox,
+                                         self.trackingNumberSpinBox, self.verifyButton, self.programButton)
+
+        # At most one of CT and temperature can be enabled. The group isn't exclusive because an exclusive
+        # group won't let the user turn both off again.
+        self.ctTempGroup = QButtonGroup()
+        self.ctTempGroup.setExclusive(False)
+        self.ctTempGroup.addButton(self.ctEnableButton)
+        self.ctTempGroup.addButton(self.tempEnableButton)
+
+        # Settings that are only editable while their optional sensor is enabled
+        self.sensorWidgets = {
+            self.lightEnableButton: (self.lightNumSamplesLabel, self.lightNumSamplesSpinBox,
+                                     self.lightMatchGNSSCheckbox, self.lightGainLabel, self.lightGainComboBox),
+            self.turbidityEnableButton: (self.turbidityNumSamplesLabel, self.turbidityNumSamplesSpinBox,
+                                         self.turbidityMatchGNSSCheckbox),
+        }
+
         self.disableAllOptionalSensors()
         self.connectUIElements()
         self.fillComboBoxes()
@@ -511,165 +690,113 @@ class Ui_MainWindow(object):
         self.displayPicture()
 
         self.statusTextEdit.setFont(QFont("Courier New"))
+        self.statusTextEdit.document().setMaximumBlockCount(STATUS_MAX_BLOCKS)
 
-        (self.writeText
-        ("           _        "
-         "       ______       "
-         " _____ _____ _____  "
-         "   \r\n"
-         " _ __ ___ (_) ___ _ "
-         "__ ___/ ___\\ \\    "
-         "  / /_ _|  ___|_   _"
-         "|    \r\n"
-         "| \'_ ` _ \\| |/ __|"
-         " \'__/ _ \\___ \\\\ "
-         "\\ /\\ / / | || |_  "
-         "  | |      \r\n"
-         "| | | | | | | (__| |"
-         " | (_) |__) |\\ V  V"
-         " /  | ||  _|   | |  "
-         "    \r\n"
-         "|_|_|_| |_|_|\\___|_"
-         "|  \\___/____/  \\_/"
-         "\\_/  |___|_|     |_"
-         "|      \r\n"
-         "|  _ \\ _ __ ___   _"
-         "_ _ _ __ __ _ _ __ _"
-         "__  _ __ ___   ___ _"
-         " __ \r\n"
-         "| |_) | \'__/ _ \\ /"
-         " _` | \'__/ _` | \'_"
-         " ` _ \\| \'_ ` _ \\ "
-         "/ _ \\ \'__|\r\n"
-         "|  __/| | | (_) | (_"
-         "| | | | (_| | | | | "
-         "| | | | | | |  __/ |"
-         "   \r\n"
-         "|_|   |_|  \\___/ \\"
-         "__, |_|  \\__,_|_| |"
-         "_| |_|_| |_| |_|\\__"
-         "_|_|   \r\n"
-         "                 |__"
-         "_/                  "
-         "                    "
-         "   "
-         "\r\r\nDon't forget to update this tool!!! Insert repo link here."))
+        self.writeText(_BANNER)
 
+        if not PROGRAMMER_FOUND:
+            self.appendError(f"\nSTM32_Programmer_CLI not found at "
+                             f"{PROGRAMMER_PATH or 'any known path for ' + _SYSTEM}. "
+                             "Install STM32CubeProgrammer before programming a device.")
 
     def assembleBinaryConfigFile(self):
-        get_int_from_str = lambda s: int(re.search(r'\d+', s).group()) if re.search(r'\d+', s) else None
-
-        with open(self.configFilePath, "wb") as configFile:
-            '''
-            
-            Definition of configuration struct from configuration.h in firmware files
-
-            typedef struct __attribute__((packed)) microSWIFT_configuration
-            {
-              uint32_t tracking_number;
-              uint32_t gnss_samples_per_window;
-              uint32_t duty_cycle;
-              uint32_t iridium_max_transmit_time;
-              uint32_t gnss_max_acquisition_wait_time;
-              uint32_t gnss_sampling_rate;
-              uint32_t total_light_samples;
-              uint32_t light_sensor_gain;
-              uint32_t total_turbidity_samples;
-            
-              bool iridium_v3f;
-              bool gnss_high_performance_mode;
-              bool ct_enabled;
-              bool temperature_enabled;
-              bool light_enabled;
-              bool turbidity_enabled;
-            
-              const char compile_date_flash[11];
-              const char compile_time_flash[9];
-            } microSWIFT_configuration;
-            
-            In microSWIFT.ld:
-            
-              /* Custom variables (firmware version, compile date/time, etc) */
-              .uservars :
-              {
-                /* Variables contained in type microSWIFT_configuration contained in configuration.h */
-                KEEP(*(.uservars.CONFIGURATION))
-                *(.uservars*);
-              } > USERVARS
-            '''
-
-            current_datetime = datetime.now()
-
-            # Format the date and time strings
-            date = current_datetime.strftime("%m/%d/%Y")  # MM/DD/YYYY
-            time = current_datetime.strftime("%H:%M:%S")  # HH:MM:SS
-            date += "\x00"  # null terminated
-            time += "\x00"  # null terminated
-
-            configStruct = struct.pack("<LLLLLLLLLL??????B11s9s",
-                                       int(self.trackingNumberSpinBox.value()),
-                                       int(self.gnssNumSamplesSpinBox.value()),
-                                       int(self.dutyCycleSpinBox.value()),
-                                       int(self.iridiumTxTimeSpinBox.value()),
-                                       int(self.gnssMaxAcquisitionTimeSpinBox.value()),
-                                       get_int_from_str(self.gnssSampleRateComboBox.currentText()),
-                                       int(self.lightNumSamplesSpinBox.value()),
-                                       int(self.lightGainComboBox.currentIndex()),
-                                       int(self.turbidityNumSamplesSpinBox.value()),
-                                       bool(self.iridiumTypeComboBox.currentText() == "V3F"),
-                                       bool(self.gnssHighPerformanceModeCheckBox.isChecked()),
-                                       bool(self.ctEnableButton.isChecked()),
-                                       bool(self.tempEnableButton.isChecked()),
-                                       bool(self.lightEnableButton.isChecked()),
-                                       bool(self.turbidityEnableButton.isChecked()),
-                                       bytes(date.encode("utf-8")),
-                                       bytes(time.encode("utf-8"))
-                                       )
-
-            num_bytes = len(configStruct)
-            configFile.write(configStruct)
+        '''
+        
+        Definition of configuration struct from configuration.h in firmware files
+
+        typedef struct __attribute__((packed)) microSWIFT_configuration
+        {
+          uint32_t tracking_number;
+          uint32_t gnss_samples_per_window;
+          uint32_t duty_cycle;
+          uint32_t iridium_max_transmit_time;
+          uint32_t gnss_max_acquisition_wait_time;
+          uint32_t gnss_sampling_rate;
+          uint32_t total_light_samples;
+          uint32_t light_sensor_gain;
+          uint32_t total_turbidity_samples;
+        
+          bool iridium_v3f;
+          bool gnss_high_performance_mode;
+          bool ct_enabled;
+          bool temperature_enabled;
+          bool light_enabled;
+          bool turbidity_enabled;
+        
+          const char compile_date_flash[11];
+          const char compile_time_flash[9];
+        } microSWIFT_configuration;
+        
+        In microSWIFT.ld:
+        
+          /* Custom variables (firmware version, compile date/time, etc) */
+          .uservars :
+          {
+            /* Variables contained in type microSWIFT_configuration contained in configuration.h */
+            KEEP(*(.uservars.CONFIGURATION))
+            *(.uservars*);
+          } > USERVARS
+        '''
+
+        current_datetime = datetime.now()
+
+        # Format the date and time as ASCII; the 11s/9s fields are one byte longer than the text, so
+        # struct pads in the null terminator
+        compile_date = current_datetime.strftime("%m/%d/%Y").encode("ascii")  # MM/DD/YYYY
+        compile_time = current_datetime.strftime("%H:%M:%S").encode("ascii")  # HH:MM:SS
+
+        _CONFIG_STRUCT.pack_into(self.configBuffer, 0,
+                                 self.trackingNumberSpinBox.value(),
+                                 self.gnssNumSamplesSpinBox.value(),
+                                 self.dutyCycleSpinBox.value(),
+                                 self.iridiumTxTimeSpinBox.value(),
+                                 self.gnssMaxAcquisitionTimeSpinBox.value(),
+                                 _GNSS_RATE_HZ[self.gnssSampleRateComboBox.currentText()],
+                                 self.lightNumSamplesSpinBox.value(),
+                                 self.lightGainComboBox.currentIndex(),
+                                 self.turbidityNumSamplesSpinBox.value(),
+                                 self.iridiumTypeComboBox.currentText() == "V3F",
+                                 self.gnssHighPerformanceModeCheckBox.isChecked(),
+                                 self.ctEnableButton.isChecked(),
+                                 self.tempEnableButton.isChecked(),
+                                 self.lightEnableButton.isChecked(),
+                                 self.turbidityEnableButton.isChecked(),
+                                 compile_date,
+                                 compile_time
+                                 )
+
+        # One write() straight to the file descriptor, skipping Python's file object layer. O_BINARY keeps
+        # Windows from translating 0x0A bytes in the struct.
+        fd = os.open(self.configFilePath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            written = os.write(fd, self.configBuffer)
+        finally:
+            os.close(fd)
+
+        # A short write would flash a truncated config without any complaint from the programmer
+        if written != len(self.configBuffer):
+            raise OSError(f"Only wrote {written} of {len(self.configBuffer)} bytes to {self.configFilePath}")
 
     def fillComboBoxes(self):
         # Iridium type drop box
-        self.iridiumTypeComboBox.addItem("V3D")
-        self.iridiumTypeComboBox.addItem("V3F")
-
-        # GNSS sampling ratre drop box
-        self.gnssSampleRateComboBox.addItem("4 Hz")
-        self.gnssSampleRateComboBox.addItem("5 Hz")
-
-        self.lightGainComboBox.addItem("0.5x")
-        self.lightGainComboBox.addItem("1x")
-        self.lightGainComboBox.addItem("2x")
-        self.lightGainComboBox.addItem("4x")
-        self.lightGainComboBox.addItem("8x")
-        self.lightGainComboBox.addItem("16x")
-        self.lightGainComboBox.addItem("32x")
-        self.lightGainComboBox.addItem("64x")
-        self.lightGainComboBox.addItem("128x")
-        self.lightGainComboBox.addItem("256x")
-        self.lightGainComboBox.addItem("512x")
+        self.iridiumTypeComboBox.addItems(["V3D", "V3F"])
 
-    def disableAllOptionalSensors(self):
-        self.lightNumSamplesLabel.setDisabled(True)
-        self.lightNumSamplesSpinBox.setDisabled(True)
+        # GNSS sampling rate drop box, labels shared with the Hz lookup
+        self.gnssSampleRateComboBox.addItems(list(_GNSS_RATE_HZ))
 
-        self.turbidityNumSamplesLabel.setDisabled(True)
-        self.turbidityNumSamplesSpinBox.setDisabled(True)
+        self.lightGainComboBox.addItems(["0.5x", "1x", "2x", "4x", "8x", "16x", "32x", "64x", "128x", "256x", "512x"])
+
+    def disableAllOptionalSensors(self):
+        for widgets in self.sensorWidgets.values():
+            for widget in widgets:
+                widget.setDisabled(True)
 
         self.programButton.setDisabled(True)
 
     def connectUIElements(self):
-        self.worker.stdoutAvailable.connect(self.appendText)
-        self.worker.stderrAvailable.connect(self.appendError)
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.reenableGUI)
-        self.worker.finished.connect(self.threadFinished)
-
-        self.ctEnableButton.clicked.connect(self.onCtEnabledClick)
-        self.tempEnableButton.clicked.connect(self.onTempEnabledClick)
-        self.lightEnableButton.clicked.connect(self.onLightEnabledClick)
-        self.turbidityEnableButton.clicked.connect(self.onTurbidityEnabledClick)
+        self.ctTempGroup.buttonClicked.connect(self.onCtTempClicked)
+        for sensorButton in self.sensorWidgets:
+            sensorButton.clicked.connect(functools.partial(self.onSensorEnabledClick, sensorButton))
         self.lightMatchGNSSCheckbox.clicked.connect(self.onLightMatchGnssClicked)
         self.turbidityMatchGNSSCheckbox.clicked.connect(self.onTurbidityMatchGnssClicked)
 
@@ -680,95 +807,94 @@ class Ui_MainWindow(object):
         self.lightGainComboBox.currentIndexChanged.connect(self.resetVerifyButton)
         self.turbidityNumSamplesSpinBox.valueChanged.connect(self.resetVerifyButton)
         self.iridiumTxTimeSpinBox.valueChanged.connect(self.resetVerifyButton)
-        self.gnssNumSamplesSpinBox.valueChanged.connect(self.resetVerifyButton)
-        self.gnssNumSamplesSpinBox.valueChanged.connect(self.onLightMatchGnssClicked)
-        self.gnssNumSamplesSpinBox.valueChanged.connect(self.onTurbidityMatchGnssClicked)
-        self.gnssSampleRateComboBox.currentIndexChanged.connect(self.onLightMatchGnssClicked)
-        self.gnssSampleRateComboBox.currentIndexChanged.connect(self.onTurbidityMatchGnssClicked)
+        self.gnssNumSamplesSpinBox.valueChanged.connect(self.onGnssParamsChanged)
+        self.gnssSampleRateComboBox.currentIndexChanged.connect(self.onGnssParamsChanged)
         self.dutyCycleSpinBox.valueChanged.connect(self.resetVerifyButton)
         self.gnssMaxAcquisitionTimeSpinBox.valueChanged.connect(self.resetVerifyButton)
         self.trackingNumberSpinBox.valueChanged.connect(self.resetVerifyButton)
 
         self.iridiumTypeComboBox.currentIndexChanged.connect(self.resetVerifyButton)
-        self.gnssSampleRateComboBox.currentIndexChanged.connect(self.resetVerifyButton)
-
-    def onCtEnabledClick(self):
-        if self.ctEnableButton.isChecked():
-            self.tempEnableButton.setChecked(False)
 
-        self.resetVerifyButton()
+        # Serial device nodes come and go under /dev on macOS and Linux, so plugging in the STLink
+        # triggers a rescan instead of polling. Windows has no /dev; it rescans on Program.
+        if os.path.isdir("/dev"):
+            self.deviceWatcher = QFileSystemWatcher()
+            self.deviceWatcher.addPath("/dev")
+            self.deviceWatcher.directoryChanged.connect(self.onDevicesChanged)
 
-    def onTempEnabledClick(self):
-        if self.tempEnableButton.isChecked():
-            self.ctEnableButton.setChecked(False)
+    def onCtTempClicked(self, clickedButton):
+        if clickedButton.isChecked():
+            for button in self.ctTempGroup.buttons():
+                if button is not clickedButton:
+                    button.setChecked(False)
 
         self.resetVerifyButton()
 
-    def onLightEnabledClick(self):
-        if self.lightEnableButton.isChecked():
-            self.lightNumSamplesLabel.setEnabled(True)
-            self.lightNumSamplesSpinBox.setEnabled(True)
-            self.lightMatchGNSSCheckbox.setEnabled(True)
-            self.lightGainLabel.setEnabled(True)
-            self.lightGainComboBox.setEnabled(True)
-        else:
-            self.lightNumSamplesLabel.setDisabled(True)
-            self.lightNumSamplesSpinBox.setDisabled(True)
-            self.lightMatchGNSSCheckbox.setDisabled(True)
-            self.lightGainLabel.setDisabled(True)
-            self.lightGainComboBox.setDisabled(True)
+    def onSensorEnabledClick(self, sensorButton, checked):
+        for widget in self.sensorWidgets[sensorButton]:
+            widget.setEnabled(checked)
 
         self.resetVerifyButton()
 
     def onLightMatchGnssClicked(self):
-        get_int_from_str = lambda s: int(re.search(r'\d+', s).group()) if re.search(r'\d+', s) else None
         if self.lightMatchGNSSCheckbox.isChecked():
-            self.lightNumSamplesSpinBox.setDisabled(True)
-            self.lightNumSamplesSpinBox.setValue(int((self.gnssNumSamplesSpinBox.value() /
-                                                     get_int_from_str(self.gnssSampleRateComboBox.currentText()) / 2)))
+            self.matchLightToGnss(self.gnssNumSamplesSpinBox.value(),
+                                  _GNSS_RATE_HZ[self.gnssSampleRateComboBox.currentText()])
 
         self.resetVerifyButton()
 
-    def onTurbidityEnabledClick(self):
-        if self.turbidityEnableButton.isChecked():
-            self.turbidityNumSamplesLabel.setEnabled(True)
-            self.turbidityNumSamplesSpinBox.setEnabled(True)
-            self.turbidityMatchGNSSCheckbox.setEnabled(True)
-        else:
-            self.turbidityNumSamplesLabel.setDisabled(True)
-            self.turbidityNumSamplesSpinBox.setDisabled(True)
-            self.turbidityMatchGNSSCheckbox.setDisabled(True)
+    def onTurbidityMatchGnssClicked(self):
+        if self.turbidityMatchGNSSCheckbox.isChecked():
+            self.matchTurbidityToGnss(self.gnssNumSamplesSpinBox.value(),
+                                      _GNSS_RATE_HZ[self.gnssSampleRateComboBox.currentText()])
 
         self.resetVerifyButton()
 
-    def onTurbidityMatchGnssClicked(self):
-        get_int_from_str = lambda s: int(re.search(r'\d+', s).group()) if re.search(r'\d+', s) else None
+    def onGnssParamsChanged(self):
+        # Single slot for GNSS sample count/rate changes so both match-GNSS updates share one read
+        num_gnss_samples = self.gnssNumSamplesSpinBox.value()
+        gnss_sample_rate = _GNSS_RATE_HZ[self.gnssSampleRateComboBox.currentText()]
+
+        if self.lightMatchGNSSCheckbox.isChecked():
+            self.matchLightToGnss(num_gnss_samples, gnss_sample_rate)
         if self.turbidityMatchGNSSCheckbox.isChecked():
-            self.turbidityNumSamplesSpinBox.setDisabled(True)
-            self.turbidityNumSamplesSpinBox.setValue(int(self.gnssNumSamplesSpinBox.value() /
-                                                         get_int_from_str(self.gnssSampleRateComboBox.currentText())))
+            self.matchTurbidityToGnss(num_gnss_samples, gnss_sample_rate)
 
         self.resetVerifyButton()
 
+    def matchLightToGnss(self, num_gnss_samples, gnss_sample_rate):
+        # Light samples at 0.5 Hz over the GNSS window
+        self.lightNumSamplesSpinBox.setDisabled(True)
+        with QSignalBlocker(self.lightNumSamplesSpinBox):
+            self.lightNumSamplesSpinBox.setValue(num_gnss_samples // gnss_sample_rate // 2)
+
+    def matchTurbidityToGnss(self, num_gnss_samples, gnss_sample_rate):
+        # The turbidity sensor samples at 1 Hz over the GNSS window
+        self.turbidityNumSamplesSpinBox.setDisabled(True)
+        with QSignalBlocker(self.turbidityNumSamplesSpinBox):
+            self.turbidityNumSamplesSpinBox.setValue(num_gnss_samples // gnss_sample_rate)
+
     def find_usb_port(self):
+        # Reuse a recent scan; comports() is slow
+        now = time.monotonic()
+        if self.last_port_scan is not None and now - self.last_port_scan < PORT_SCAN_TTL:
+            return
+        self.last_port_scan = now
 
-        # List all available serial ports
-        ports = serial.tools.list_ports.comports()
+        # Skip the full scan while the known /dev port is still there (never true for Windows COM names)
+        if self.device_connected and os.path.exists(self.stlink_port):
+            return
 
-        stlink_ports = []
+        # Deferred so pyserial's platform backends are only loaded when a port scan is needed
+        import serial.tools.list_ports
 
-        for port in ports:
-            # Check if the port is an STLINK
+        # List all available serial ports and take the first one that is an STLINK
+        for port in serial.tools.list_ports.comports():
             if "STLINK" in port.description:
-                stlink_ports.append(port.device)
-                break
-
-        if stlink_ports:
-            for device in stlink_ports:
                 self.devicePortLabel.setStyleSheet("font-size: 14px; color: green;")
-                self.devicePortLabel.setText(f"STLink V3 found on port {device}")
+                self.devicePortLabel.setText(f"STLink V3 found on port {port.device}")
                 self.device_connected = True
-                self.stlink_port = device
+                self.stlink_port = port.device
                 break
         else:
             self.devicePortLabel.setStyleSheet("font-size: 14px; color: red;")
@@ -778,11 +904,11 @@ class Ui_MainWindow(object):
 
         self.devicePortLabel.setWordWrap(True)
 
-    def verifySettings(self):
-        # For getting GNSS sample rate from drop down box
-        get_int_from_str = lambda s: int(re.search(r'\d+', s).group()) if re.search(r'\d+', s) else None
+    def onDevicesChanged(self):
+        self.last_port_scan = None
+        self.find_usb_port()
 
-        settings_invalid = False
+    def verifySettings(self):
         verify_strings = []
 
         # Pull all the values from the UI
@@ -792,111 +918,93 @@ class Ui_MainWindow(object):
         turbidity_num_samples = self.turbidityNumSamplesSpinBox.value()
         iridium_tx_time = self.iridiumTxTimeSpinBox.value()
         num_gnss_samples = self.gnssNumSamplesSpinBox.value()
-        gnss_sample_rate = get_int_from_str(self.gnssSampleRateComboBox.currentText())
+        gnss_sample_rate = _GNSS_RATE_HZ[self.gnssSampleRateComboBox.currentText()]
         duty_cycle = self.dutyCycleSpinBox.value()
         gnss_window_buffer = self.gnssMaxAcquisitionTimeSpinBox.value()
 
-        gnss_duration = (((num_gnss_samples / gnss_sample_rate) / 60) + 1) + gnss_window_buffer
+        # Whole minutes left for sampling after the Iridium transmit time and a minute of margin. Each
+        # window is checked as an integer sample count against what fits in that time.
+        sample_window_mins = duty_cycle - iridium_tx_time - 1
 
-        if (duty_cycle - gnss_duration - iridium_tx_time) < 0:
+        if num_gnss_samples > (sample_window_mins - gnss_window_buffer) * 60 * gnss_sample_rate:
             verify_strings.append("Duty cycle not long enough to complete GNSS sample window.\n")
-            settings_invalid = True
 
         if light_enabled:
-            if ((duty_cycle - ((light_num_samples / 30) + 1) - iridium_tx_time) < 0):
+            if light_num_samples > sample_window_mins * 30:  # 0.5 Hz
                 verify_strings.append("Duty cycle not long enough to complete Light sample window.\n")
-                settings_invalid = True
-            if (int((self.gnssNumSamplesSpinBox.value() / get_int_from_str(self.gnssSampleRateComboBox.currentText())
-                     / 2)) > 1800):
+            if num_gnss_samples // gnss_sample_rate // 2 > 1800:
                 verify_strings.append("Max number of light samples is 1800.\n")
-                settings_invalid = True
 
         if turbidity_enabled:
-            if ((duty_cycle - ((turbidity_num_samples / 60) + 1) - iridium_tx_time) < 0):
+            if turbidity_num_samples > sample_window_mins * 60:  # 1 Hz
                 verify_strings.append("Duty cycle not long enough to complete Turbidity sample window.\n")
-                settings_invalid = True
-            if (int(self.gnssNumSamplesSpinBox.value() / get_int_from_str(self.gnssSampleRateComboBox.currentText()))
-                    > 3600):
+            if num_gnss_samples // gnss_sample_rate > 3600:
                 verify_strings.append("Max number of turbidity samples is 3600.\n")
-                settings_invalid = True
 
-        if settings_invalid:
+        if verify_strings:
             self.programButton.setDisabled(True)
-            self.verifyButton.setStyleSheet("""
-                background-color: red;
-                color: white;
-                border-radius: 5px;
-                font-size: 16px;
-                """)
-
-            write_string = "".join(verify_strings)
+            self.setVerifyState("red")
 
-            self.writeError(write_string)
+            self.writeError("".join(verify_strings))
         else:
-            self.programButton.setEnabled(True)
-            self.verifyButton.setStyleSheet("""
-                background-color: green;
-                color: white;
-                border-radius: 5px;
-                font-size: 16px;
-                """)
+            self.programButton.setEnabled(self.firmwareReady)
+            self.setVerifyState("green")
             self.writeText("Settings verified. You did a great job.")
 
     def resetVerifyButton(self):
-        self.colorScheme = QGuiApplication.styleHints().colorScheme()
-
+        # Runs on every edit; setVerifyState and writeText skip repeats
         self.programButton.setDisabled(True)
-        self.verifyButton.setStyleSheet("""
-                background-color: gray;
-                color: white;
-                border-radius: 5px;
-                font-size: 16px;
-                """)
+        self.setVerifyState("gray")
         self.writeText("Configure as desired and press the Verify button when ready.")
 
-    def writeError(self, err_str):
-        self.statusTextEdit.clear()
-
-        char_format = QTextCharFormat()
-        char_format.setForeground(QColor('red'))
-
-        self.statusTextEdit.setCurrentCharFormat(char_format)
+    def setVerifyState(self, state):
+        # setStyleSheet re-polishes the button, so only call it when the color actually changes
+        if state != self.verifyState:
+            self.verifyButton.setStyleSheet(VERIFY_BUTTON_STYLES[state])
+            self.verifyState = state
 
-        self.statusTextEdit.setText(err_str)
+    def writeError(self, err_str):
+        self.writeFormatted(err_str, self.redFormat)
 
     def writeText(self, err_str):
-        self.statusTextEdit.clear()
+        self.writeFormatted(err_str, self.textFormat())
 
-        char_format = QTextCharFormat()
-
-        if self.colorScheme == Qt.ColorScheme.Dark:
-            char_format.setForeground(QColor('white'))
-        else:
-            char_format.setForeground(QColor('black'))
-
-        self.statusTextEdit.setCurrentCharFormat(char_format)
+    def writeFormatted(self, string, charFormat):
+        # Leave the pane alone if it already shows exactly this message in this color
+        message = (string, id(charFormat))
+        if message == self.statusMessage:
+            return
 
-        self.statusTextEdit.setText(err_str)
+        self.statusTextEdit.clear()
+        self.appendFormatted(string, charFormat)
+        self.statusMessage = message
 
     def appendText(self, string):
-        char_format = QTextCharFormat()
+        self.appendFormatted(string, self.textFormat())
 
-        if self.colorScheme == Qt.ColorScheme.Dark:
-            char_format.setForeground(QColor('white'))
-        else:
-            char_format.setForeground(QColor('black'))
+    def appendError(self, string):
+        self.appendFormatted(string, self.redFormat)
 
-        self.statusTextEdit.setCurrentCharFormat(char_format)
+    def appendFormatted(self, string, charFormat):
+        # One insert and one repaint per batch
+        self.statusMessage = None
+        cursor = self.statusTextEdit.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.statusTextEdit.document().isEmpty():
+            string = "\n" + string
 
-        self.statusTextEdit.append(string)
+        self.statusTextEdit.setUpdatesEnabled(False)
+        cursor.insertText(string, charFormat)
+        self.statusTextEdit.setUpdatesEnabled(True)
 
-    def appendError(self, string):
-        char_format = QTextCharFormat()
-        char_format.setForeground(QColor('red'))
+        self.statusTextEdit.setTextCursor(cursor)
+        self.statusTextEdit.ensureCursorVisible()
 
-        self.statusTextEdit.setCurrentCharFormat(char_format)
+    def onColorSchemeChanged(self, colorScheme):
+        self.colorScheme = colorScheme
 
-        self.statusTextEdit.append(string)
+    def textFormat(self):
+        return self.whiteFormat if self.colorScheme == Qt.ColorScheme.Dark else self.blackFormat
 
     def programDevice(self):
 
@@ -906,72 +1014,64 @@ class Ui_MainWindow(object):
             self.writeError("STLink programmer not detected.")
             return
 
-        self.assembleBinaryConfigFile()
+        if not self.firmwareReady:
+            self.writeError("Firmware file has not been downloaded.")
+            return
+
+        try:
+            self.assembleBinaryConfigFile()
+        except OSError as e:
+            self.writeError(f"Could not write the configuration file: {e}")
+            return
 
         self.writeText("Running STM32 Programmer CLI, please wait.")
 
         self.disableGUI()
-        # Run the worker thread so the program will be non-blocking
-        self.thread.start()
+
+        # Run the programmer on a pooled thread so the program will be non-blocking
+        runnable = ProgramRunnable()
+        runnable.signals.stdoutAvailable.connect(self.appendText)
+        runnable.signals.stderrAvailable.connect(self.appendError)
+        runnable.signals.finished.connect(self.reenableGUI)
+        runnable.signals.finished.connect(self.threadFinished)
+        QThreadPool.globalInstance().start(runnable)
+
+    def onDownloadReady(self, state):
+        self.firmwareReady = state != FIRMWARE_MISSING
+
+        if state == FIRMWARE_MISSING:
+            self.appendError("\nFailed to download the firmware file. Check the internet connection and restart.")
+        elif state == FIRMWARE_CACHED:
+            self.appendError("\nCould not check for a firmware update, using the local copy.")
+
+        if self.firmwareReady and self.verifyState == "green":
+            self.programButton.setEnabled(True)
 
     def disableGUI(self):
-        self.ctEnableButton.setDisabled(True)
-        self.ctNumSamplesSpinBox.setDisabled(True)
-        self.tempEnableButton.setDisabled(True)
-        self.tempNumSamplesSpinBox.setDisabled(True)
-        self.lightEnableButton.setDisabled(True)
-        self.lightMatchGNSSCheckbox.setDisabled(True)
-        self.lightNumSamplesSpinBox.setDisabled(True)
-        self.turbidityEnableButton.setDisabled(True)
-        self.turbidityMatchGNSSCheckbox.setDisabled(True)
-        self.turbidityNumSamplesSpinBox.setDisabled(True)
-        self.iridiumTxTimeSpinBox.setDisabled(True)
-        self.iridiumTypeComboBox.setDisabled(True)
-        self.gnssNumSamplesSpinBox.setDisabled(True)
-        self.gnssHighPerformanceModeCheckBox.setDisabled(True)
-        self.gnssSampleRateComboBox.setDisabled(True)
-        self.dutyCycleSpinBox.setDisabled(True)
-        self.gnssMaxAcquisitionTimeSpinBox.setDisabled(True)
-        self.trackingNumberSpinBox.setDisabled(True)
-        self.verifyButton.setDisabled(True)
-        self.programButton.setDisabled(True)
+        self.setGUIEnabled(False)
 
     def reenableGUI(self):
-        self.ctEnableButton.setEnabled(True)
-
-        self.tempEnableButton.setEnabled(True)
-
-        self.lightEnableButton.setEnabled(True)
-        if self.lightEnableButton.isChecked():
-            self.lightMatchGNSSCheckbox.setEnabled(True)
-            self.lightNumSamplesSpinBox.setEnabled(True)
-
-        self.turbidityEnableButton.setEnabled(True)
-        if self.turbidityEnableButton.isChecked():
-            self.turbidityMatchGNSSCheckbox.setEnabled(True)
-            self.turbidityNumSamplesSpinBox.setEnabled(True)
-
-        self.iridiumTxTimeSpinBox.setEnabled(True)
-        self.iridiumTypeComboBox.setEnabled(True)
-        self.gnssNumSamplesSpinBox.setEnabled(True)
-        self.gnssHighPerformanceModeCheckBox.setEnabled(True)
-        self.gnssSampleRateComboBox.setEnabled(True)
-        self.dutyCycleSpinBox.setEnabled(True)
-        self.gnssMaxAcquisitionTimeSpinBox.setEnabled(True)
-        self.trackingNumberSpinBox.setEnabled(True)
-        self.verifyButton.setEnabled(True)
-        self.programButton.setEnabled(True)
+        self.setGUIEnabled(True)
+
+    def setGUIEnabled(self, enabled):
+        for widget in self.programmingLockedWidgets:
+            widget.setEnabled(enabled)
+
+        # Optional sensor settings only come back if their sensor is enabled
+        for sensorButton, widgets in self.sensorWidgets.items():
+            sensorEnabled = enabled and sensorButton.isChecked()
+            for widget in widgets:
+                widget.setEnabled(sensorEnabled)
 
     def displayPicture(self):
+        if self.pixmapItem is not None:
+            return
 
         self.graphicsView.setScene(self.scene)
-        pixmap = QPixmap("microSWIFT_pic.png")
-        pixmapItem = QGraphicsPixmapItem(pixmap)
-        self.scene.addItem(pixmapItem)
+        self.pixmapItem = QGraphicsPixmapItem(logo_pixmap())
+        self.scene.addItem(self.pixmapItem)
 
     def threadFinished(self):
-        self.thread.quit()
-        self.thread.wait()
         os.remove(self.configFilePath)
 
 
@@ -980,9 +1080,6 @@ if __name__ == "__main__":
     MainWindow = QtWidgets.QMainWindow()
     ui = Ui_MainWindow()
     ui.setupUi(MainWindow)
-    firmware_updated = download_microSWIFT_firmware()
-    if not firmware_updated:
-        sys.exit(1)
     MainWindow.show()
     sys.exit(app.exec())
 